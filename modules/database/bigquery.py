@@ -6,13 +6,14 @@ from google.cloud import bigquery
 
 # Local imports
 from modules.aws.secrets import fetch_secret
+from modules.database.compact import compact_dataframe_from_arrow
 
 
 class BigQuery:
     """
     Use me to interact with a Google BigQuery instance. Update the intializer method to direct to the service account credentials that relate to the BigQuery instance you'd like to connect to.
     \n\nThe following methods are made available:
-        - `execute_bigquery_query`: Executes a SQL query against respective BigQuery instance and, if applicable, returns the query's results as a job object, or a dataframe if `return_df` is set to True.
+        - `execute_bigquery_query`: Executes a SQL query against respective BigQuery instance and, if applicable, returns the query's results as a job object, or a dataframe if `return_df` is set to True (memory-compacted if `compact_df` is also set to True).
         - `load_dataframe_to_bigquery_table`: Loads a pandas DataFrame into a specified table in one of our specific BigQuery instances.
     """
 
@@ -31,11 +32,15 @@ class BigQuery:
     def execute_bigquery_query(
             self,
             sql_query:str,
-            return_df:bool=False
+            return_df:bool=False,
+            compact_df:bool=False
         ):
         """
         Takes a SQL query as a parameter and executes it in the respective BigQuery instance. By default, the
         query's results are returned as a job object but will be returned as a dataframe if `return_df` is set to True.
+        Set `compact_df` to True as well to fetch the results as Arrow and downcast numerics, store low-cardinality strings
+        as categoricals and keep Arrow-backed dtypes, which greatly reduces the memory footprint of the returned DataFrame.
+        The full result set is still fetched before compaction, so peak memory during the fetch is not reduced.
         """
         self.client = self._create_client()
 
@@ -51,7 +56,15 @@ class BigQuery:
 
         if return_df:
             # Convert results to a DataFrame
-            return pd.DataFrame(data=[row.values() for row in self.results_for_df], columns=[column.name for column in self.results_for_df.schema])
+            if compact_df:
+                df = compact_dataframe_from_arrow(self.results_for_df.to_arrow())
+            else:
+                df = pd.DataFrame(data=[row.values() for row in self.results_for_df], columns=[column.name for column in self.results_for_df.schema])
+
+            # The DataFrame holds its own copy of the data, so release the row iterator
+            self.results_for_df = None
+
+            return df
         
         else:
             return self.results
@@ -0,0 +1,162 @@
+# Standard library imports
+
+# Third party imports
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Local imports
+
+
+###  Helpers for materializing query results as memory-efficient DataFrames. Used by the `compact_df` option of our database query methods.  ###
+
+def compact_dataframe_from_rows(
+        rows: list,
+        columns: list,
+        category_threshold: float=0.5
+    ) -> pd.DataFrame:
+    """
+    Builds a compact DataFrame from a list of row tuples, as returned by a DB-API cursor's `fetchall()`.
+
+    Each column is converted straight into an Arrow array (skipping the object-dtype DataFrame altogether) and then compacted:
+    integers are downcast to the smallest type that fits, floats are downcast to float32 when that is lossless, low-cardinality
+    strings become categoricals and everything else (strings, decimals, dates, timestamps) is kept as an Arrow-backed dtype.
+    Columns with mixed Python types, or integers too large for Arrow, are left as object dtype.
+
+    `rows` is consumed: it is emptied in place so the row tuples, and then each column's Python objects, can be freed as soon
+    as they've been converted. Callers should not keep any other reference to the rows if they want the memory back.
+
+    Parameters
+    ----------
+        rows (list): A list of row tuples. Emptied by this function.
+        columns (list): The column names, in the same order as the values in each row. May contain duplicates.
+        category_threshold (float): Maximum ratio of distinct values to rows for a string column to be stored as a categorical.
+
+    Returns
+    -------
+        pd.DataFrame: A DataFrame using compact, dtype-aware columns.
+    """
+
+    # Transpose the rows into per-column lists, popping each row tuple off the end so it's released straight away
+    column_values = [[] for _ in columns]
+
+    while rows:
+        row = rows.pop()
+        for values, value in zip(column_values, row):
+            values.append(value)
+
+    compacted_columns = []
+
+    for values in column_values:
+        values.reverse()
+
+        try:
+            array = pa.array(values)
+
+        except (pa.ArrowException, OverflowError):
+            compacted_columns.append(pd.Series(values, dtype=object))
+
+        else:
+            compacted_columns.append(_compact_arrow_column(array, category_threshold))
+
+        # Release this column's Python objects before converting the next one
+        values.clear()
+
+    return _build_dataframe(compacted_columns, columns)
+
+
+def compact_dataframe_from_arrow(
+        table: pa.Table,
+        category_threshold: float=0.5
+    ) -> pd.DataFrame:
+    """
+    Builds a compact DataFrame from a pyarrow Table, applying the same per-column compaction as `compact_dataframe_from_rows`.
+    The table's buffers stay alive until the caller drops its reference to it; only the returned DataFrame is compacted.
+
+    Parameters
+    ----------
+        table (pa.Table): A pyarrow Table, e.g. the result of a BigQuery `RowIterator.to_arrow()`. May contain duplicate column names.
+        category_threshold (float): Maximum ratio of distinct values to rows for a string column to be stored as a categorical.
+
+    Returns
+    -------
+        pd.DataFrame: A DataFrame using compact, dtype-aware columns.
+    """
+
+    compacted_columns = [_compact_arrow_column(array, category_threshold) for array in table.columns]
+
+    return _build_dataframe(compacted_columns, table.column_names)
+
+
+def _build_dataframe(compacted_columns, columns):
+    """Assemble compacted Series into a DataFrame positionally, so duplicate column names are all kept."""
+
+    df = pd.DataFrame(dict(enumerate(compacted_columns)))
+    df.columns = columns
+
+    return df
+
+
+def _compact_arrow_column(array, category_threshold):
+    """Convert a single Arrow array into the most compact pandas Series we can represent it with."""
+
+    pa_type = array.type
+
+    if pa.types.is_dictionary(pa_type):
+        return pd.Series(array.to_pandas())
+
+    if pa.types.is_integer(pa_type):
+        array = array.cast(_smallest_integer_type(array))
+
+    elif pa.types.is_float64(pa_type) and _is_float32_lossless(array):
+        array = array.cast(pa.float32(), safe=False)
+
+    elif (pa.types.is_string(pa_type) or pa.types.is_large_string(pa_type)) and _is_low_cardinality(array, category_threshold):
+        return pd.Series(array.dictionary_encode().to_pandas())
+
+    return pd.Series(pd.arrays.ArrowExtensionArray(array))
+
+
+def _smallest_integer_type(array):
+    """Return the smallest Arrow integer type, of the same signedness, that can hold every value of an integer array."""
+
+    min_max = pc.min_max(array)
+    min_value, max_value = min_max["min"].as_py(), min_max["max"].as_py()
+
+    # Empty or all-null column, nothing to size against
+    if min_value is None:
+        return array.type
+
+    if pa.types.is_unsigned_integer(array.type):
+        candidates = ((pa.uint8(), np.uint8), (pa.uint16(), np.uint16), (pa.uint32(), np.uint32))
+    else:
+        candidates = ((pa.int8(), np.int8), (pa.int16(), np.int16), (pa.int32(), np.int32))
+
+    for pa_int_type, np_int_type in candidates:
+        # Never widen a column that is already at least as narrow as the candidate
+        if pa_int_type.bit_width >= array.type.bit_width:
+            break
+
+        int_info = np.iinfo(np_int_type)
+        if int_info.min <= min_value and max_value <= int_info.max:
+            return pa_int_type
+
+    return array.type
+
+
+def _is_float32_lossless(array):
+    """Check whether every value in a float64 array survives a round trip through float32 unchanged."""
+
+    round_tripped = array.cast(pa.float32(), safe=False).cast(pa.float64())
+
+    return pc.all(pc.equal(round_tripped, array)).as_py() is not False
+
+
+def _is_low_cardinality(array, category_threshold):
+    """Check whether a string array has few enough distinct values to be worth dictionary-encoding."""
+
+    if len(array) == 0:
+        return False
+
+    return pc.count_distinct(array).as_py() / len(array) <= category_threshold
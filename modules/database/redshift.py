@@ -6,6 +6,7 @@ import pandas as pd
 
 # Local imports
 from modules.aws.secrets import fetch_secret
+from modules.database.compact import compact_dataframe_from_rows
 
 
 class Redshift:
@@ -23,7 +24,8 @@ class Redshift:
     def query_redshift(
             self,
             sql_query:str,
-            return_df:bool=False
+            return_df:bool=False,
+            compact_df:bool=False
         ):
         """
         Executes a `select` statement against a Redshift database and
@@ -33,6 +35,7 @@ class Redshift:
         ----------
             sql_query (str): A SQL query to fetch data from Redshift.
             return_df (bool): Boolean value that returns a DataFrame when set to True.
+            compact_df (bool): When returning a DataFrame, downcast numerics, store low-cardinality strings as categoricals and use Arrow-backed dtypes to reduce its memory usage. Rows are still fetched in full first, so this shrinks the returned DataFrame, not peak memory during the fetch.
 
         Returns
         -------
@@ -52,7 +55,16 @@ class Redshift:
         self._disconnect()
 
         if return_df:
-            return pd.DataFrame(data=self.data, columns=self.columns)
+            if compact_df:
+                # Empties self.data in place, freeing the row tuples as they're converted
+                df = compact_dataframe_from_rows(self.data, self.columns)
+            else:
+                df = pd.DataFrame(data=self.data, columns=self.columns)
+
+            # The DataFrame holds its own copy of the data, so release the row tuples
+            self.data = None
+
+            return df
     
         else:
             return self.columns, self.data
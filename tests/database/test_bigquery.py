@@ -0,0 +1,51 @@
+# Standard library imports
+from types import SimpleNamespace
+
+# Third party imports
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+pytest.importorskip("google.cloud.bigquery")
+
+# Local imports
+from modules.database.bigquery import BigQuery
+
+
+class FakeRowIterator:
+    schema = [SimpleNamespace(name="id"), SimpleNamespace(name="colour")]
+
+    def __iter__(self):
+        return iter([SimpleNamespace(values=lambda row=row: row) for row in [(1, "red"), (2, "red"), (3, "red")]])
+
+    def to_arrow(self):
+        return pa.table({"id": [1, 2, 3], "colour": ["red", "red", "red"]})
+
+
+class FakeClient:
+    def query(self, sql_query, job_config=None):
+        return SimpleNamespace(result=FakeRowIterator)
+
+
+@pytest.fixture
+def bq(monkeypatch):
+    # Skip __init__ so no AWS secret is fetched
+    bq = BigQuery.__new__(BigQuery)
+    monkeypatch.setattr(bq, "_create_client", FakeClient)
+    return bq
+
+
+def test_execute_bigquery_query_compact_df(bq):
+    df = bq.execute_bigquery_query("SELECT 1", return_df=True, compact_df=True)
+
+    assert df.dtypes["id"] == pd.ArrowDtype(pa.int8())
+    assert isinstance(df.dtypes["colour"], pd.CategoricalDtype)
+    assert bq.results_for_df is None
+
+
+def test_execute_bigquery_query_return_df_releases_results(bq):
+    df = bq.execute_bigquery_query("SELECT 1", return_df=True)
+
+    assert df.dtypes["id"] == "int64"
+    assert pd.api.types.is_string_dtype(df.dtypes["colour"])
+    assert bq.results_for_df is None
@@ -0,0 +1,121 @@
+# Standard library imports
+import math
+
+# Third party imports
+import pandas as pd
+import pyarrow as pa
+
+# Local imports
+from modules.database.compact import compact_dataframe_from_arrow, compact_dataframe_from_rows
+
+
+def test_integers_are_downcast_to_smallest_type():
+    rows = [(1, 300, 70000), (-2, -300, -70000)]
+
+    df = compact_dataframe_from_rows(rows, ["a", "b", "c"])
+
+    assert df.dtypes["a"] == pd.ArrowDtype(pa.int8())
+    assert df.dtypes["b"] == pd.ArrowDtype(pa.int16())
+    assert df.dtypes["c"] == pd.ArrowDtype(pa.int32())
+    assert df["c"].tolist() == [70000, -70000]
+
+
+def test_integer_column_with_nulls_keeps_nulls():
+    df = compact_dataframe_from_rows([(1,), (None,), (3,)], ["a"])
+
+    assert df.dtypes["a"] == pd.ArrowDtype(pa.int8())
+    assert df["a"].isna().tolist() == [False, True, False]
+
+
+def test_unsigned_integers_are_not_widened():
+    table = pa.table({
+        "small": pa.array([0, 255], pa.uint8()),
+        "medium": pa.array([0, 255], pa.uint32()),
+        "signed": pa.array([-1, 1], pa.int8())
+    })
+
+    df = compact_dataframe_from_arrow(table)
+
+    assert df.dtypes["small"] == pd.ArrowDtype(pa.uint8())
+    assert df.dtypes["medium"] == pd.ArrowDtype(pa.uint8())
+    assert df.dtypes["signed"] == pd.ArrowDtype(pa.int8())
+
+
+def test_floats_are_downcast_only_when_lossless():
+    df = compact_dataframe_from_rows([(1.5, 0.1), (None, 0.2)], ["exact", "lossy"])
+
+    assert df.dtypes["exact"] == pd.ArrowDtype(pa.float32())
+    assert df.dtypes["lossy"] == pd.ArrowDtype(pa.float64())
+    assert df["lossy"].tolist() == [0.1, 0.2]
+
+
+def test_float_column_with_nan_is_not_downcast():
+    df = compact_dataframe_from_rows([(1.5,), (math.nan,)], ["a"])
+
+    assert df.dtypes["a"] == pd.ArrowDtype(pa.float64())
+
+
+def test_low_cardinality_strings_become_categoricals():
+    rows = [("red", f"id-{i}") for i in range(10)]
+
+    df = compact_dataframe_from_rows(rows, ["colour", "id"])
+
+    assert isinstance(df.dtypes["colour"], pd.CategoricalDtype)
+    assert df.dtypes["id"] == pd.ArrowDtype(pa.string())
+
+
+def test_category_threshold_is_configurable():
+    rows = [("a",), ("b",), ("a",), ("b",)]
+
+    assert isinstance(compact_dataframe_from_rows(list(rows), ["x"], category_threshold=0.5).dtypes["x"], pd.CategoricalDtype)
+    assert compact_dataframe_from_rows(list(rows), ["x"], category_threshold=0.25).dtypes["x"] == pd.ArrowDtype(pa.string())
+
+
+def test_mixed_types_fall_back_to_object():
+    df = compact_dataframe_from_rows([(1,), ("a",)], ["x"])
+
+    assert df.dtypes["x"] == object
+    assert df["x"].tolist() == [1, "a"]
+
+
+def test_overflowing_integers_fall_back_to_object():
+    df = compact_dataframe_from_rows([(2**64,), (1,)], ["x"])
+
+    assert df.dtypes["x"] == object
+    assert df["x"].tolist() == [2**64, 1]
+
+
+def test_empty_results_keep_columns():
+    df = compact_dataframe_from_rows([], ["a", "b"])
+
+    assert df.columns.tolist() == ["a", "b"]
+    assert len(df) == 0
+
+    df = compact_dataframe_from_arrow(pa.table({"a": pa.array([], pa.int64())}))
+
+    assert df.columns.tolist() == ["a"]
+    assert len(df) == 0
+
+
+def test_duplicate_column_names_are_all_kept():
+    df = compact_dataframe_from_rows([(1, 2), (3, 4)], ["id", "id"])
+
+    assert df.columns.tolist() == ["id", "id"]
+    assert df.iloc[:, 0].tolist() == [1, 3]
+    assert df.iloc[:, 1].tolist() == [2, 4]
+
+    table = pa.Table.from_arrays([pa.array([1, 3]), pa.array([2, 4])], names=["id", "id"])
+    df = compact_dataframe_from_arrow(table)
+
+    assert df.columns.tolist() == ["id", "id"]
+    assert df.iloc[:, 0].tolist() == [1, 3]
+    assert df.iloc[:, 1].tolist() == [2, 4]
+
+
+def test_rows_are_consumed_and_order_is_kept():
+    rows = [(i,) for i in range(5)]
+
+    df = compact_dataframe_from_rows(rows, ["a"])
+
+    assert rows == []
+    assert df["a"].tolist() == [0, 1, 2, 3, 4]
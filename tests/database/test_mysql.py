@@ -0,0 +1,46 @@
+# Standard library imports
+
+# Third party imports
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+pytest.importorskip("mysql.connector")
+
+# Local imports
+from modules.database.mysql import MySQL
+
+
+class FakeCursor:
+    description = [("id",), ("colour",)]
+
+    def execute(self, query, args=None):
+        pass
+
+    def fetchall(self):
+        return [(1, "red"), (2, "red"), (3, "red")]
+
+
+@pytest.fixture
+def mysql(monkeypatch):
+    # Skip __init__ so no AWS secret is fetched
+    mysql = MySQL.__new__(MySQL)
+    monkeypatch.setattr(mysql, "_connect", lambda: setattr(mysql, "cursor", FakeCursor()))
+    monkeypatch.setattr(mysql, "_disconnect", lambda: None)
+    return mysql
+
+
+def test_query_mysql_compact_df(mysql):
+    df = mysql.query_mysql("SELECT 1", return_df=True, compact_df=True)
+
+    assert df.dtypes["id"] == pd.ArrowDtype(pa.int8())
+    assert isinstance(df.dtypes["colour"], pd.CategoricalDtype)
+    assert mysql.data is None
+
+
+def test_query_mysql_return_df_releases_data(mysql):
+    df = mysql.query_mysql("SELECT 1", return_df=True)
+
+    assert df.dtypes["id"] == "int64"
+    assert pd.api.types.is_string_dtype(df.dtypes["colour"])
+    assert mysql.data is None
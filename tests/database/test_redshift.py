@@ -0,0 +1,46 @@
+# Standard library imports
+
+# Third party imports
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+pytest.importorskip("psycopg2")
+
+# Local imports
+from modules.database.redshift import Redshift
+
+
+class FakeCursor:
+    description = [("id",), ("colour",)]
+
+    def execute(self, query, args=None):
+        pass
+
+    def fetchall(self):
+        return [(1, "red"), (2, "red"), (3, "red")]
+
+
+@pytest.fixture
+def redshift(monkeypatch):
+    # Skip __init__ so no AWS secret is fetched
+    redshift = Redshift.__new__(Redshift)
+    monkeypatch.setattr(redshift, "_connect", lambda: setattr(redshift, "cursor", FakeCursor()))
+    monkeypatch.setattr(redshift, "_disconnect", lambda: None)
+    return redshift
+
+
+def test_query_redshift_compact_df(redshift):
+    df = redshift.query_redshift("SELECT 1", return_df=True, compact_df=True)
+
+    assert df.dtypes["id"] == pd.ArrowDtype(pa.int8())
+    assert isinstance(df.dtypes["colour"], pd.CategoricalDtype)
+    assert redshift.data is None
+
+
+def test_query_redshift_return_df_releases_data(redshift):
+    df = redshift.query_redshift("SELECT 1", return_df=True)
+
+    assert df.dtypes["id"] == "int64"
+    assert pd.api.types.is_string_dtype(df.dtypes["colour"])
+    assert redshift.data is None